@@ -1,6 +1,11 @@
 import json
 import time
 
+try:
+    import orjson
+except ImportError:  # orjson is optional for the mock
+    orjson = None
+
 class MockLogger:
     def __init__(self):
         self.events = []
@@ -21,6 +26,10 @@ class MockLogger:
         print(f"📊 SUMMARY: Hard={hard_score}, Soft={soft_score}, Verdict={verdict}")
         
     def save(self):
-        with open("session_log_mock.json", "w", encoding='utf-8') as f:
-            json.dump({"events": self.events}, f, indent=2)
+        if orjson is not None:
+            with open("session_log_mock.json", "wb") as f:
+                f.write(orjson.dumps({"events": self.events}, option=orjson.OPT_INDENT_2))
+        else:
+            with open("session_log_mock.json", "w", encoding='utf-8') as f:
+                json.dump({"events": self.events}, f, separators=(",", ":"))
         print("💾 Saved to session_log_mock.json")
\ No newline at end of file
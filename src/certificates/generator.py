@@ -1,22 +1,15 @@
-import json
+import functools
 import os
+import sys
+import orjson
 import requests
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+from concurrent.futures import ThreadPoolExecutor
 from eth_account import Account
 from eth_account.messages import encode_defunct
-from web3 import Web3
-from dotenv import load_dotenv
-
-import json
-import os
-import requests
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from eth_account import Account
-from eth_account.messages import encode_defunct
-from web3 import Web3
+from eth_abi.packed import encode_packed
+from eth_utils import keccak
 from dotenv import load_dotenv
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 load_dotenv()
 
@@ -24,6 +17,9 @@ PINATA_API_KEY = os.getenv("PINATA_API_KEY")
 PINATA_SECRET_KEY = os.getenv("PINATA_SECRET_KEY")
 ADMIN_PRIVATE_KEY = os.getenv("ADMIN_PRIVATE_KEY")
 
+# One HTTP session for all Pinata calls, so the TLS connection is reused
+_session = requests.Session()
+
 def generate_pdf(data, filename="certificate.pdf"):
     """Generates a PDF certificate based on session data."""
     # Ensure filename is in data/certificates/
@@ -32,6 +28,10 @@ def generate_pdf(data, filename="certificate.pdf"):
     
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     
+    # reportlab is slow to import, only pay for it when a PDF is actually rendered
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    
     c = canvas.Canvas(filename, pagesize=letter)
     width, height = letter
 
@@ -68,8 +68,12 @@ def upload_to_pinata(filename):
     print("[INFO] Initiating upload to Pinata IPFS...")
     
     with open(filename, "rb") as file:
-        files = {"file": file}
-        response = requests.post(url, files=files, headers=headers)
+        # Stream the PDF from disk instead of building the whole multipart body in memory
+        encoder = MultipartEncoder(fields={
+            "file": (os.path.basename(filename), file, "application/pdf")
+        })
+        headers["Content-Type"] = encoder.content_type
+        response = _session.post(url, data=encoder, headers=headers)
         
         if response.status_code != 200:
             print(f"[ERROR] Pinata API upload failed. Status Code: {response.status_code}")
@@ -81,56 +85,85 @@ def upload_to_pinata(filename):
         print(f"[INFO] Upload successful. IPFS Hash: {ipfs_hash}")
         return ipfs_hash
 
+@functools.lru_cache(maxsize=1)
+def _admin_account():
+    """Admin account, derived from the private key once (on first use, not at import)."""
+    return Account.from_key(ADMIN_PRIVATE_KEY)
+
+@functools.lru_cache(maxsize=256)
+def _sign_payload(ipfs_hash, session_id_str):
+    # Same digest as Web3.solidity_keccak(['string', 'string'], ...), without the Web3 wrapper
+    encoded_data = keccak(encode_packed(['string', 'string'], [ipfs_hash, session_id_str]))
+    
+    message = encode_defunct(primitive=encoded_data)
+    signed_message = _admin_account().sign_message(message)
+    return "0x" + signed_message.signature.hex()
+
 def sign_voucher(ipfs_hash, session_id):
     """Signs the payload (Hash + SessionID) using the Admin Private Key."""
-    session_id_str = str(session_id)
-    
-    encoded_data = Web3.solidity_keccak(
-        ['string', 'string'],
-        [ipfs_hash, session_id_str]
-    )
-    
-    message = encode_defunct(hexstr=encoded_data.hex())
-    signed_message = Account.sign_message(message, ADMIN_PRIVATE_KEY)
+    signature = _sign_payload(ipfs_hash, str(session_id))
     
     print("[INFO] Data signed securely by Admin wallet.")
-    return "0x" + signed_message.signature.hex()
+    return signature
 
-def main():
+def _process_one(session_path):
+    """PDF -> IPFS upload -> signature for one session log. Returns the mint data or None."""
     try:
-        with open("session_log.json", "r") as f:
-            data = json.load(f)
+        with open(session_path, "rb") as f:
+            data = orjson.loads(f.read())
     except FileNotFoundError:
-        print("[ERROR] File 'session_log.json' not found in the current directory.")
-        return
+        print(f"[ERROR] File '{session_path}' not found.")
+        return None
 
-    pdf_filename = generate_pdf(data)
+    pdf_filename = generate_pdf(data, filename=f"certificate_{data['session_id']}.pdf")
 
     try:
         ipfs_hash = upload_to_pinata(pdf_filename)
     except Exception as e:
-        print("[CRITICAL] Process terminated due to upload failure.")
-        return
+        print(f"[CRITICAL] Upload failed for '{session_path}'.")
+        return None
 
     try:
         signature = sign_voucher(ipfs_hash, data['session_id'])
     except Exception as e:
-        return
+        return None
 
-    output = {
+    return {
         "session_id": str(data['session_id']),
         "ipfs_hash": ipfs_hash,
         "signature": signature,
         "pdf_url": f"https://gateway.pinata.cloud/ipfs/{ipfs_hash}"
     }
 
+def _warm_up_pinata():
+    """Open the TLS connection to Pinata ahead of the first upload."""
+    try:
+        _session.head("https://api.pinata.cloud/", timeout=5)
+    except requests.RequestException:
+        pass
+
+def main(session_paths=("session_log.json",)):
+    session_paths = list(session_paths)
+
+    # Uploads are network-bound, so threads overlap them well. With a single
+    # session, the connection to Pinata is opened while the PDF is rendered.
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        ex.submit(_warm_up_pinata)
+        results = [r for r in ex.map(_process_one, session_paths) if r is not None]
+
+    if not results:
+        print("[CRITICAL] Process terminated, no certificate was produced.")
+        return
+
     output_path = os.path.join("data", "certificates", "mint_data.json")
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=4)
+    with open(output_path, "wb") as f:
+        # A single session keeps the original flat format
+        f.write(orjson.dumps(results[0] if len(session_paths) == 1 else results, option=orjson.OPT_INDENT_2))
     
-    print("\n[SUCCESS] Operation completed.")
+    print(f"\n[SUCCESS] Operation completed ({len(results)}/{len(session_paths)} certificates).")
     print(f"[INFO] Minting data saved to '{output_path}'.")
     print("[INFO] Ready to execute frontend minting transaction.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Usage: python generator.py [session_log.json ...]
+    main(sys.argv[1:] or ["session_log.json"])
\ No newline at end of file
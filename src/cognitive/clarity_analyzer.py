@@ -3,8 +3,10 @@ ClarityAnalyzer - Main module for analyzing candidate explanations.
 Supports both FakeLLM and OpenAI API modes.
 """
 
-import json
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
 
 from .llm_config import (
@@ -19,6 +21,16 @@ from .llm_config import (
 from .fake_llm import FakeLLM
 from .prompts import get_system_prompt
 
+# The system prompt is constant: build it once at import
+_SYSTEM_PROMPT = get_system_prompt()
+
+_REQUIRED_FIELDS = ("coherence", "terminology", "completeness", "comment")
+
+
+def _clamp_score(value: int) -> int:
+    """Clamp a score to the 0-100 range."""
+    return 0 if value < 0 else 100 if value > 100 else value
+
 
 class ClarityAnalyzer:
     """
@@ -52,6 +64,21 @@ class ClarityAnalyzer:
             self.api_key = OPENAI_API_KEY
             self.model = OPENAI_MODEL
             self.temperature = OPENAI_TEMPERATURE
+            
+            # One pooled keep-alive connection instead of a new TCP+TLS handshake per call
+            self._http = requests.Session()
+            self._http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            self._http.headers.update({
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            })
+            
+            # Static part of every analysis request; only the user message changes
+            self._body_static = {
+                "model": self.model,
+                "temperature": self.temperature,
+            }
+            self._system_message = {"role": "system", "content": _SYSTEM_PROMPT}
         
         if DEBUG:
             print(f"[DEBUG] ClarityAnalyzer initialized in {self.mode} mode")
@@ -81,41 +108,49 @@ class ClarityAnalyzer:
         else:
             return self._analyze_with_openai(transcript)
     
-    def _analyze_with_openai(self, transcript: str, retry_count: int = 0) -> Dict[str, Any]:
+    def _analyze_with_openai(self, transcript: str) -> Dict[str, Any]:
         """
         Analyze using OpenAI API.
         
+        Timeouts are retried up to MAX_RETRIES times with exponential backoff;
+        the request body is serialized once and reused across attempts.
+        
         Args:
             transcript: Text to analyze
-            retry_count: Current retry attempt
         
         Returns:
             dict: Analysis result or error response
         """
+        body = orjson.dumps({
+            **self._body_static,
+            "messages": [
+                self._system_message,
+                {"role": "user", "content": f"Analyze this explanation:\n\n{transcript}"}
+            ]
+        })
+        
         try:
-            if DEBUG:
-                print(f"[DEBUG] Calling OpenAI API (attempt {retry_count + 1})")
-            
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "temperature": self.temperature,
-                    "messages": [
-                        {"role": "system", "content": get_system_prompt()},
-                        {"role": "user", "content": f"Analyze this explanation:\n\n{transcript}"}
-                    ]
-                },
-                timeout=TIMEOUT_SECONDS
-            )
+            for attempt in range(MAX_RETRIES + 1):
+                if DEBUG:
+                    print(f"[DEBUG] Calling OpenAI API (attempt {attempt + 1})")
+                
+                try:
+                    response = self._http.post(
+                        "https://api.openai.com/v1/chat/completions",
+                        data=body,
+                        timeout=TIMEOUT_SECONDS
+                    )
+                    break
+                except requests.exceptions.Timeout:
+                    if attempt == MAX_RETRIES:
+                        return self._error_response("API timeout after retries")
+                    if DEBUG:
+                        print(f"[DEBUG] Timeout, retrying... ({attempt + 1}/{MAX_RETRIES})")
+                    time.sleep(2 ** attempt)
             
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if "choices" not in data or len(data["choices"]) == 0:
                 return self._error_response("Invalid API response structure")
@@ -127,8 +162,8 @@ class ClarityAnalyzer:
             
             # Parse JSON
             try:
-                result = json.loads(content)
-            except json.JSONDecodeError as e:
+                result = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
                 # Try to extract JSON from response
                 result = self._extract_json(content)
                 if result is None:
@@ -137,16 +172,6 @@ class ClarityAnalyzer:
             # Validate and normalize
             return self._validate_response(result)
         
-        except requests.exceptions.Timeout:
-            if retry_count < MAX_RETRIES:
-                if DEBUG:
-                    print(f"[DEBUG] Timeout, retrying... ({retry_count + 1}/{MAX_RETRIES})")
-                import time
-                time.sleep(2 ** retry_count)
-                return self._analyze_with_openai(transcript, retry_count + 1)
-            else:
-                return self._error_response("API timeout after retries")
-        
         except requests.exceptions.ConnectionError as e:
             return self._error_response(f"Connection error: {str(e)}")
         
@@ -187,8 +212,8 @@ class ClarityAnalyzer:
         json_str = text[start_idx:end_idx + 1]
         
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
             return None
     
     def _validate_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -201,21 +226,24 @@ class ClarityAnalyzer:
         Returns:
             dict: Validated response
         """
-        required_fields = ["coherence", "terminology", "completeness", "comment"]
+        coherence = data.get("coherence")
+        terminology = data.get("terminology")
+        completeness = data.get("completeness")
+        comment = data.get("comment")
         
         # Check required fields
-        for field in required_fields:
-            if field not in data:
-                return self._error_response(f"Missing field: {field}")
+        if coherence is None or terminology is None or completeness is None or comment is None:
+            missing = next(f for f in _REQUIRED_FIELDS if data.get(f) is None)
+            return self._error_response(f"Missing field: {missing}")
         
         try:
             # Normalize scores to 0-100
-            data["coherence"] = max(0, min(100, int(data["coherence"])))
-            data["terminology"] = max(0, min(100, int(data["terminology"])))
-            data["completeness"] = max(0, min(100, int(data["completeness"])))
+            data["coherence"] = _clamp_score(int(coherence))
+            data["terminology"] = _clamp_score(int(terminology))
+            data["completeness"] = _clamp_score(int(completeness))
             
             # Normalize comment
-            data["comment"] = str(data["comment"])[:500]
+            data["comment"] = str(comment)[:500]
             
             if DEBUG:
                 print(f"[DEBUG] Validated response: {data}")
@@ -225,6 +253,16 @@ class ClarityAnalyzer:
         except (ValueError, TypeError) as e:
             return self._error_response(f"Invalid score format: {str(e)}")
     
+    def _error_response(self, error_msg: str) -> Dict[str, Any]:
+        """
+        Build a zero-score response carrying an error message.
+        
+        Args:
+            error_msg: What went wrong
+        
+        Returns:
+            dict: Response in the same shape as a successful analysis
+        """
         return {
             "coherence": 0,
             "terminology": 0,
@@ -255,12 +293,8 @@ class ClarityAnalyzer:
         Analyze code using OpenAI API.
         """
         try:
-            response = requests.post(
+            response = self._http.post(
                 "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
                 json={
                     "model": self.model,
                     "temperature": self.temperature,
@@ -273,7 +307,7 @@ class ClarityAnalyzer:
             )
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if "choices" not in data or len(data["choices"]) == 0:
                 return 0
@@ -283,7 +317,7 @@ class ClarityAnalyzer:
             # Extract JSON
             result = self._extract_json(content)
             if result and "score" in result:
-                return max(0, min(100, int(result["score"])))
+                return _clamp_score(int(result["score"]))
             
             return 0
             
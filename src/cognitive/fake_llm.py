@@ -13,6 +13,15 @@ class FakeLLM:
     Useful for testing without OpenAI API key.
     """
     
+    # Different comments
+    _COMMENTS = (
+        "Good logical flow, could add more edge cases.",
+        "Clear explanation, terminology needs improvement.",
+        "Comprehensive analysis, minor gaps in structure.",
+        "Strong technical vocabulary, consider more alternatives.",
+        "Well-organized, address constraints more explicitly.",
+    )
+    
     def __init__(self, seed: int = None):
         """
         Initialize FakeLLM.
@@ -20,8 +29,8 @@ class FakeLLM:
         Args:
             seed: Optional seed for reproducible results
         """
-        if seed is not None:
-            random.seed(seed)
+        # Own generator: seeding no longer touches the global random state
+        self._rng = random.Random(seed)
     
     def analyze(self, transcript: str) -> Dict[str, Any]:
         """
@@ -42,20 +51,11 @@ class FakeLLM:
             }
         
         # Generate random scores in ranges
-        coherence = random.randint(50, 95)
-        terminology = random.randint(50, 90)
-        completeness = random.randint(45, 85)
-        
-        # Different comments
-        comments = [
-            "Good logical flow, could add more edge cases.",
-            "Clear explanation, terminology needs improvement.",
-            "Comprehensive analysis, minor gaps in structure.",
-            "Strong technical vocabulary, consider more alternatives.",
-            "Well-organized, address constraints more explicitly."
-        ]
+        coherence = self._rng.randint(50, 95)
+        terminology = self._rng.randint(50, 90)
+        completeness = self._rng.randint(45, 85)
         
-        comment = random.choice(comments)
+        comment = self._rng.choice(self._COMMENTS)
         
         return {
             "coherence": coherence,
@@ -72,4 +72,4 @@ class FakeLLM:
             return 0
             
         # Random score for mock mode
-        return random.randint(60, 95)
+        return self._rng.randint(60, 95)
@@ -2,18 +2,21 @@
 Configuration for LLM modes and API settings.
 """
 
+import functools
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-from pathlib import Path
-env_path = Path(__file__).parent.parent.parent / '.env'
-print(f"DEBUG: Loading .env from {env_path}")
-load_dotenv(dotenv_path=env_path)
 
-# Check if key is loaded
-key = os.getenv("OPENAI_API_KEY")
-print(f"DEBUG: OPENAI_API_KEY found: {bool(key)}")
+@functools.cache
+def _load_env():
+    """Load the project .env once per process, however often this module is imported."""
+    env_path = Path(__file__).parent.parent.parent / '.env'
+    load_dotenv(dotenv_path=env_path)
+    return env_path
+
+
+_ENV_PATH = _load_env()
 
 # Режим роботи: "fake" або "real"
 LLM_MODE = os.getenv("LLM_MODE", "fake")
@@ -29,3 +32,7 @@ TIMEOUT_SECONDS = 10
 
 # Debug
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+if DEBUG:
+    print(f"DEBUG: Loaded .env from {_ENV_PATH}")
+    print(f"DEBUG: OPENAI_API_KEY found: {bool(OPENAI_API_KEY)}")
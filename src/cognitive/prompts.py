@@ -3,6 +3,10 @@ System prompt for LLM to analyze candidate explanations.
 This prompt is optimized for strict JSON output.
 """
 
+from functools import cache
+
+
+@cache
 def get_system_prompt() -> str:
     """
     Returns the system prompt for LLM.
@@ -62,6 +66,7 @@ STRICT RULES:
 Now analyze the explanation provided."""
 
 
+@cache
 def get_validation_prompt() -> str:
     """
     A simpler prompt just for validating JSON structure.
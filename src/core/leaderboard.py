@@ -1,8 +1,10 @@
-import json
+import bisect
 import os
 import time
 from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+import orjson
 
 @dataclass
 class LeaderboardEntry:
@@ -14,28 +16,84 @@ class LeaderboardEntry:
     ai_overview: str
     code_content: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Explicit field dict, cheaper than dataclasses.asdict"""
+        return {
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "hard_score": self.hard_score,
+            "soft_score": self.soft_score,
+            "total_score": self.total_score,
+            "ai_overview": self.ai_overview,
+            "code_content": self.code_content,
+        }
+
+def _rank_key(entry: LeaderboardEntry) -> float:
+    """Sort key for self.entries: ascending key == descending total score"""
+    return -entry.total_score
+
 class Leaderboard:
+    """
+    Storage: leaderboard.json is a sorted snapshot, and leaderboard.jsonl holds
+    the entries added since that snapshot, one per line. New entries are only
+    appended; compact() folds the log back into the snapshot.
+    """
+
+    # Fold the append log into the snapshot once it holds this many entries
+    COMPACT_EVERY = 50
+
     def __init__(self, filepath: str = "data/leaderboard.json"):
         self.filepath = filepath
+        self.log_path = os.path.splitext(filepath)[0] + ".jsonl"
         self.entries: List[LeaderboardEntry] = []
+        self._pending = 0  # entries in the append log
         self._load()
 
     def _load(self):
+        self.entries = []
+        self._pending = 0
         if os.path.exists(self.filepath):
             try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
+                with open(self.filepath, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.entries = [LeaderboardEntry(**entry) for entry in data]
-            except (json.JSONDecodeError, TypeError):
+            except (orjson.JSONDecodeError, TypeError):
                 print(f"[Leaderboard] Warning: Could not load {self.filepath}. Starting fresh.")
                 self.entries = []
-        else:
-            self.entries = []
+
+        if os.path.exists(self.log_path):
+            # Skip entries already in the snapshot (compact() interrupted before truncating the log)
+            seen = {(e.name, e.timestamp) for e in self.entries}
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    # A partially written last line is ignored
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = LeaderboardEntry(**orjson.loads(line))
+                    except (orjson.JSONDecodeError, TypeError):
+                        continue
+                    self._pending += 1
+                    if (entry.name, entry.timestamp) not in seen:
+                        self.entries.append(entry)
+
+        # Sorted once here; add_entry keeps the order from then on
+        self.entries.sort(key=_rank_key)
 
     def save(self):
+        """Write the full sorted snapshot."""
         os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-        with open(self.filepath, 'w') as f:
-            json.dump([asdict(e) for e in self.entries], f, indent=2)
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps([e.to_dict() for e in self.entries], option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.filepath)
+
+    def compact(self):
+        """Rewrite the snapshot with every entry and empty the append log."""
+        self.save()
+        with open(self.log_path, 'wb'):
+            pass
+        self._pending = 0
 
     def add_entry(self, name: str, hard_score: int, soft_score: int, ai_overview: str, code_content: str):
         total_score = (hard_score + soft_score) / 2
@@ -48,10 +106,16 @@ class Leaderboard:
             ai_overview=ai_overview,
             code_content=code_content
         )
-        self.entries.append(entry)
-        # Sort by total score descending
-        self.entries.sort(key=lambda x: x.total_score, reverse=True)
-        self.save()
+        # Insert in place, keeping total score descending (ties: newest last)
+        bisect.insort_right(self.entries, entry, key=_rank_key)
+        
+        # Append one line instead of rewriting the whole leaderboard
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, 'ab') as f:
+            f.write(orjson.dumps(entry.to_dict()) + b"\n")
+        self._pending += 1
+        if self._pending >= self.COMPACT_EVERY:
+            self.compact()
         print(f"[Leaderboard] Entry added for {name}!")
 
     def display(self, top_n: int = 5):
@@ -1,18 +1,30 @@
-import json
+import atexit
+import io
 import os
+import queue
 import time
 import threading
 import uuid
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Tuple
+
+import orjson
+
+
+# Files produced by a session:
+# - session_log.jsonl: one event per line, appended while the session runs
+# - session_meta.json: small sidecar with ids, timestamps and summary
+# - session_log.json:  full document (meta + events), written when the session ends
+DATA_DIR = "data"
+SESSION_LOG_PATH = os.path.join(DATA_DIR, "session_log.json")
+EVENTS_PATH = os.path.join(DATA_DIR, "session_log.jsonl")
+META_PATH = os.path.join(DATA_DIR, "session_meta.json")
 
 
 # 1. Define clean data structures
-@dataclass
-class Event:
-    ts: float
-    type: str  # "STATE" or "CLARITY"
-    payload: Dict[str, Any]
+# Events are plain dicts: {"ts": float, "type": "STATE" | "CLARITY" | ..., "payload": dict}
+# so they serialize as-is and appending one never touches past events.
+Event = Dict[str, Any]
 
 
 @dataclass
@@ -26,68 +38,273 @@ class SessionData:
         "hard_score": 0, "soft_score": 0, "verdict": "PENDING"
     })
 
+    def meta(self) -> Dict[str, Any]:
+        """Everything except the events list"""
+        return {
+            "session_id": self.session_id,
+            "candidate_id": self.candidate_id,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "summary": self.summary,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Explicit field dict (no dataclasses.asdict deep copy); events are shared, not copied."""
+        return {
+            "session_id": self.session_id,
+            "candidate_id": self.candidate_id,
+            "started_at": self.started_at,
+            "events": self.events,
+            "ended_at": self.ended_at,
+            "summary": self.summary,
+        }
+
+    def to_json(self, option: Optional[int] = None) -> bytes:
+        """Serialize the whole session; events are already plain dicts."""
+        return orjson.dumps(self.to_dict(), option=option)
+
+
+def read_meta(meta_path: str = META_PATH) -> dict:
+    """Read the sidecar meta file (session ids, timestamps, summary)."""
+    with open(meta_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def read_events(events_path: str = EVENTS_PATH, offset: int = 0) -> Tuple[List[Event], int]:
+    """
+    Read the complete events in the stream from byte `offset` on. Returns them
+    with the offset to resume from, so a reader can follow the stream as it
+    grows without re-parsing what it already has.
+    """
+    events = []
+    try:
+        with open(events_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                # The last line may still be half-written by the logger
+                if not line.endswith(b"\n"):
+                    break
+                events.append(orjson.loads(line))
+                offset += len(line)
+    except FileNotFoundError:
+        pass
+    return events, offset
+
 
 # 2. The Logger Class
+_STOP = object()  # Sentinel that tells the writer thread to exit
+
+
 class SessionLogger:
     def __init__(self, candidate_id: str):
-        self.lock = threading.Lock()  # Crucial for multithreading
-        self.filepath = os.path.join("data", "session_log.json")
-        os.makedirs("data", exist_ok=True)
+        self.filepath = SESSION_LOG_PATH
+        self.events_path = EVENTS_PATH
+        self.meta_path = META_PATH
+        os.makedirs(DATA_DIR, exist_ok=True)
         self.data = SessionData(
             session_id=str(uuid.uuid4()),
             candidate_id=candidate_id,
             started_at=time.time()
         )
-        
-        # Initial save to create the file
-        self._flush()
-    
-    def _flush(self):
-        """Internal method to write to disk. Always called under lock."""
-        with open(self.filepath, 'w') as f:
-            # asdict converts dataclasses to dicts automatically
-            json.dump(asdict(self.data), f, indent=2)
-    
-    def log_state(self, state: str):
-        """Called by Role 3 (Window Monitor)"""
-        with self.lock:
-            ts = time.time() - self.data.started_at
-            event = Event(ts=round(ts, 2), type="STATE", payload={"state": state})
+        # Event timestamps are offsets from this monotonic reading;
+        # started_at stays as the wall-clock reference.
+        self._t0 = time.perf_counter()
+
+        # Batched flushing: push events to disk every N events or T seconds
+        # instead of on every single event.
+        self._dirty_count = 0
+        self._last_flush_ts = time.monotonic()
+        self._flush_threshold = 20
+        self._flush_interval_s = 2.0
+        # Upper bound on events taken off the queue for one write
+        self._max_batch = 256
+
+        # Event stream, opened lazily on the first event (see _open_stream)
+        self._fh = None
+
+        # Last logged STATE, so repeated identical states collapse into one event
+        self._last_state = None
+
+        # Producers (monitor, LLM, audio threads) only enqueue; a single writer
+        # thread owns self.data.events and the event stream, so nobody waits on disk.
+        self._queue = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(target=self._drain, daemon=True)
+        self._writer_thread.start()
+
+        # Don't lose buffered events if the process exits without finish_session
+        atexit.register(self._force_flush)
+
+    def _open_stream(self):
+        """
+        Create the event stream and the meta sidecar. Deferred until there is
+        something to write, so a logger that never logs costs no disk I/O.
+        """
+        # Events are appended to the stream, never rewritten. A new session
+        # starts a new stream. The 64 KiB buffer coalesces small event writes
+        # into a few large syscalls; it is drained by _flush_locked (or when full).
+        self._fh = io.BufferedWriter(open(self.events_path, 'wb', buffering=0), buffer_size=65536)
+        # The full log is only written when a session ends; drop the previous
+        # session's copy so readers fall back to this session's stream
+        try:
+            os.remove(self.filepath)
+        except FileNotFoundError:
+            pass
+        self._write_meta()
+
+    def _write_meta(self):
+        """Write the sidecar meta file."""
+        with open(self.meta_path, 'wb') as f:
+            f.write(orjson.dumps(self.data.meta()))
+
+    def _write_session_log(self):
+        """
+        Write the full session document (meta + events). This happens once, when
+        the session ends, so it is indented for humans; the runtime stream stays compact.
+        """
+        self.export_pretty(self.filepath)
+
+    def export_pretty(self, path: str):
+        """Write an indented copy of the session for humans."""
+        with open(path, 'wb') as f:
+            f.write(self.data.to_json(option=orjson.OPT_INDENT_2))
+
+    def _flush_locked(self):
+        """Push buffered events to disk. Only called from the writer thread (or after it stopped)."""
+        if self._fh is not None:
+            self._fh.flush()
+        self._dirty_count = 0
+        self._last_flush_ts = time.monotonic()
+
+    def _maybe_flush(self):
+        """Flush only once enough events piled up or the interval elapsed."""
+        if (self._dirty_count >= self._flush_threshold
+                or time.monotonic() - self._last_flush_ts >= self._flush_interval_s):
+            self._flush_locked()
+
+    def _append_events(self, events: List[Event]):
+        """Add a batch of events to the in-memory log and the event stream in one write."""
+        if self._fh is None:
+            self._open_stream()
+        lines = []
+        for event in events:
+            try:
+                lines.append(orjson.dumps(event) + b"\n")
+            except TypeError as e:
+                # Drop it here, or the final to_json() of the whole session would fail too
+                print(f"[SessionLogger] Dropped unserializable {event.get('type')} event: {e}")
+                continue
             self.data.events.append(event)
-            self._flush()
-    
+        self._fh.write(b"".join(lines))
+        self._dirty_count += len(lines)
+        self._maybe_flush()
+
+    def _drain(self):
+        """
+        Writer thread: take events off the queue until the stop sentinel arrives.
+        Whatever piled up behind the first event (up to _max_batch) is written along with it.
+        """
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self._flush_interval_s)]
+            except queue.Empty:
+                # Quiet period: make sure pending events still reach the disk
+                if self._dirty_count:
+                    try:
+                        self._flush_locked()
+                    except OSError as e:
+                        print(f"[SessionLogger] Failed to flush events: {e}")
+                continue
+            try:
+                while batch[-1] is not _STOP and len(batch) < self._max_batch:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            # A failed write must not kill the writer thread: everything logged
+            # after it would be lost silently. Report it and keep draining.
+            if batch:
+                try:
+                    self._append_events(batch)
+                except Exception as e:
+                    print(f"[SessionLogger] Failed to write {len(batch)} event(s): {e}")
+            if stop:
+                try:
+                    self._flush_locked()
+                except OSError as e:
+                    print(f"[SessionLogger] Failed to flush events: {e}")
+                return
+
+    def _stop_writer(self):
+        """Drain the queue and wait for the writer thread to exit."""
+        if self._writer_thread.is_alive():
+            self._queue.put(_STOP)
+            self._writer_thread.join()
+
+    def _force_flush(self):
+        """Write any pending events to disk (atexit hook)."""
+        self._stop_writer()
+
+    def log_state(self, state: str):
+        """Called by Role 3 (Window Monitor). Consecutive duplicates are dropped."""
+        if state == self._last_state:
+            return
+        self._last_state = state
+        ts = time.perf_counter() - self._t0
+        self._queue.put({"ts": round(ts, 2), "type": "STATE", "payload": {"state": state}})
+
     def log_clarity(self, clarity_data: dict):
         """Called by Role 2 (LLM Engine)"""
-        with self.lock:
-            ts = time.time() - self.data.started_at
-            event = Event(ts=round(ts, 2), type="CLARITY", payload=clarity_data)
-            self.data.events.append(event)
-            self._flush()
+        ts = time.perf_counter() - self._t0
+        self._queue.put({"ts": round(ts, 2), "type": "CLARITY", "payload": clarity_data})
 
     def log_event(self, event_type: str, payload: dict):
         """Generic event logger"""
-        with self.lock:
-            ts = time.time() - self.data.started_at
-            event = Event(ts=round(ts, 2), type=event_type, payload=payload)
-            self.data.events.append(event)
-            self._flush()
-    
-    def finish_session(self, hard_score: int, soft_score: int, verdict: str):
-        """Finalize the logs"""
-        with self.lock:
-            self.data.ended_at = time.time()
-            self.data.summary = {
-                "hard_score": hard_score,
-                "soft_score": soft_score,
-                "verdict": verdict
-            }
-            self._flush()
-
-    def update_candidate_id(self, new_id: str):
-        """Update the candidate ID and save to file"""
-        with self.lock:
-            self.data.candidate_id = new_id
-            self._flush()
+        ts = time.perf_counter() - self._t0
+        self._queue.put({"ts": round(ts, 2), "type": event_type, "payload": payload})
 
+    def finish_session(self, hard_score: int, soft_score: int, verdict: str):
+        """Finalize the logs. Events logged after this point are not written."""
+        self._stop_writer()
+        self.data.ended_at = time.time()
+        self.data.summary = {
+            "hard_score": hard_score,
+            "soft_score": soft_score,
+            "verdict": verdict
+        }
+        if self._fh is None:
+            self._open_stream()
+        # The writer thread has flushed and exited; make the stream durable and
+        # release it, so the next session can delete or replace the file (Windows)
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        self._fh = None
+        self._write_meta()
+        self._write_session_log()
 
+    def _owns_files(self) -> bool:
+        """
+        True while the files under data/ still belong to this session. Once the
+        dashboard has started another session they are deleted or replaced, and
+        the meta sidecar carries the new session id.
+        """
+        try:
+            return read_meta(self.meta_path).get("session_id") == self.data.session_id
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return False
 
+    def update_candidate_id(self, new_id: str) -> bool:
+        """
+        Update the candidate ID and save to file. Returns False (and writes
+        nothing) if a newer session has taken over the files in the meantime.
+        """
+        self.data.candidate_id = new_id
+        if not self._owns_files():
+            return False
+        self._write_meta()
+        if self.data.ended_at is not None:
+            self._write_session_log()
+        return True
@@ -1,8 +1,9 @@
 """
 Simple Streamlit dashboard for visualizing a single candidate session log.
 
-Expected input file:
-- data/session_log.json
+Expected input files:
+- data/session_log.json (finished session)
+- data/session_meta.json + data/session_log.jsonl (session still running)
 
 The app shows:
 - Summary: key scores and time spent in each state
@@ -10,19 +11,23 @@ The app shows:
 - Clarity: clarity-related metrics if CLARITY events are present
 """
 
-import json
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
 
+import orjson
 import pandas as pd
-import altair as alt
+from pandas.api.types import union_categoricals
 import streamlit as st
 import sys
+from watchfiles import watch
 
 # Ensure src modules can be imported
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 from src.core.leaderboard import Leaderboard
 from src.core.leaderboard import Leaderboard
+from src.core.session_logger import EVENTS_PATH, META_PATH, SESSION_LOG_PATH, read_events, read_meta
 from src.certificates import generator as certificate_generator
 
 
@@ -37,6 +42,10 @@ STATE_TO_CODE: Dict[str, int] = {
     "RESEARCHING": 2,
 }
 
+# Categorical dtype for the "state" column; category order follows STATE_TO_CODE,
+# so the column's codes are exactly the numeric codes above
+STATE_DTYPE = pd.CategoricalDtype(sorted(STATE_TO_CODE, key=STATE_TO_CODE.get))
+
 # Page configuration – UI only
 st.set_page_config(
     page_title="GlassBox – Process Audit",
@@ -49,12 +58,51 @@ st.set_page_config(
 # Data loading & transform
 # =========================
 
+@st.cache_resource(show_spinner=False)
+def _event_tail_store() -> Dict[str, Any]:
+    """Process-wide state for read_running_session."""
+    return {"lock": threading.Lock(), "session_id": None, "offset": 0, "events": []}
+
+
+def read_running_session(events_path: str = EVENTS_PATH, meta_path: str = META_PATH) -> dict:
+    """
+    Rebuild the document of a session that is still running from the meta
+    sidecar and the JSONL event stream. The events read so far are kept with
+    a byte offset into the stream, so each call only parses the lines appended
+    since the previous one. Starts over when the session id changes or the
+    stream got shorter (a new session replaced it).
+
+    The returned events list is the store's own list, not a copy: it only ever
+    grows at the end, so earlier results stay valid prefixes of it.
+    """
+    data = read_meta(meta_path)
+    try:
+        size = os.path.getsize(events_path)
+    except OSError:
+        size = 0
+
+    store = _event_tail_store()
+    with store["lock"]:
+        if store["session_id"] != data.get("session_id") or size < store["offset"]:
+            store.update(session_id=data.get("session_id"), offset=0, events=[])
+        new_events, store["offset"] = read_events(events_path, store["offset"])
+        store["events"].extend(new_events)
+        data["events"] = store["events"]
+    return data
+
+
 def load_session_log(path: str) -> dict:
     """
     Load session log JSON file from the given path and return it as a Python dict.
+
+    While a session is running the full log does not exist yet, so the document
+    is rebuilt from the meta sidecar and the JSONL event stream instead.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    try:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    except FileNotFoundError:
+        data = read_running_session(EVENTS_PATH, META_PATH)
     return data
 
 
@@ -76,31 +124,19 @@ def events_to_df(events: List[Dict[str, Any]]) -> pd.DataFrame:
     - ts: event time in seconds from session start (float)
     - type: event type, e.g. "STATE" or "CLARITY"
     - state: "CODING", "RESEARCHING", "IDLE" or None
+    - state_code: STATE_TO_CODE value of state (nullable Int8), for numeric plots
     - coherence, terminology, completeness, comment:
       optional clarity-related fields (None/NaN where not present).
-    """
-    rows: List[Dict[str, Any]] = []
-
-    for ev in events:
-        payload = ev.get("payload", {}) or {}
 
-        row: Dict[str, Any] = {
-            "ts": ev.get("ts"),
-            "type": ev.get("type"),
-            "state": payload.get("state"),
-            "coherence": payload.get("coherence"),
-            "terminology": payload.get("terminology"),
-            "completeness": payload.get("completeness"),
-            "comment": payload.get("comment"),
-        }
-        rows.append(row)
-
-    if not rows:
+    Rows are sorted by ts (ties keep log order), so callers don't re-sort.
+    """
+    if not events:
         return pd.DataFrame(
             columns=[
                 "ts",
                 "type",
                 "state",
+                "state_code",
                 "coherence",
                 "terminology",
                 "completeness",
@@ -108,20 +144,189 @@ def events_to_df(events: List[Dict[str, Any]]) -> pd.DataFrame:
             ]
         )
 
-    df = pd.DataFrame(rows)
+    # Build the columns directly instead of one dict per row
+    ts: List[Any] = []
+    types: List[Any] = []
+    states: List[Any] = []
+    coherence: List[Any] = []
+    terminology: List[Any] = []
+    completeness: List[Any] = []
+    comments: List[Any] = []
 
-    # Sort by time if possible
-    if "ts" in df.columns:
-        try:
-            df = df.sort_values("ts")
-        except Exception:
-            # If sorting fails for any reason, keep original order
-            pass
+    for ev in events:
+        payload = ev.get("payload", {}) or {}
 
-    df = df.reset_index(drop=True)
+        ts.append(ev.get("ts"))
+        types.append(ev.get("type"))
+        state = payload.get("state")
+        # Unknown states become missing values rather than extra categories
+        states.append(state if state in STATE_TO_CODE else None)
+        coherence.append(payload.get("coherence"))
+        terminology.append(payload.get("terminology"))
+        completeness.append(payload.get("completeness"))
+        comments.append(payload.get("comment"))
+
+    # Few distinct strings: store them as small integer codes
+    state_col = pd.Categorical(states, dtype=STATE_DTYPE)
+    codes = state_col.codes  # int8, -1 where missing; equal to STATE_TO_CODE by construction
+
+    df = pd.DataFrame({
+        "ts": pd.Series(ts, dtype="float64"),
+        "type": pd.Categorical(types),
+        "state": state_col,
+        "state_code": pd.arrays.IntegerArray(codes.copy(), codes == -1),
+        "coherence": coherence,
+        "terminology": terminology,
+        "completeness": completeness,
+        "comment": comments,
+    })
+
+    # The only sort of the events; everything downstream relies on this order
+    df = df.sort_values("ts", kind="stable", ignore_index=True)
     return df
 
 
+LEADERBOARD_PATH = os.path.join("data", "leaderboard.json")
+SUBMISSIONS_DIR = "submissions"
+
+# Streamlit reruns the whole script on every interaction. The cached variants
+# below are keyed on the files' (mtime, size), so reruns reuse the parsed log
+# and its DataFrame until the logger actually writes something new.
+
+def _file_stamps(*paths: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(mtime_ns, size) of each file, None for files that don't exist."""
+    stamps = []
+    for file_path in paths:
+        try:
+            info = os.stat(file_path)
+            stamps.append((info.st_mtime_ns, info.st_size))
+        except FileNotFoundError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def session_log_stamp(path: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """
+    Cache key for a session log: stamps of the full log and of the
+    running-session files it falls back to.
+    """
+    return _file_stamps(path, META_PATH, EVENTS_PATH)
+
+
+def leaderboard_stamp(path: str = LEADERBOARD_PATH) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """Cache key for the leaderboard: stamps of its snapshot and its append log."""
+    return _file_stamps(path, os.path.splitext(path)[0] + ".jsonl")
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_session_log_cached(path: str, stamp: tuple) -> dict:
+    """
+    load_session_log, re-read only when `stamp` (see session_log_stamp) changes.
+    A resource cache, so hits return the same dict instead of unpickling a copy
+    of the whole session; callers must not modify it.
+    """
+    return load_session_log(path)
+
+
+@st.cache_resource(show_spinner=False)
+def _events_df_store() -> Dict[str, Any]:
+    """Process-wide state for events_to_df_incremental."""
+    return {"lock": threading.Lock(), "key": None, "count": 0, "df": None}
+
+
+def events_to_df_incremental(events: List[Dict[str, Any]], key: Any) -> pd.DataFrame:
+    """
+    events_to_df for an append-only event list. Only the events added since the
+    previous call are converted and appended to the cached frame; it is rebuilt
+    when `key` (the session id) changes or the list got shorter.
+
+    The returned frame is shared between reruns, so callers must not modify it.
+    """
+    store = _events_df_store()
+    with store["lock"]:
+        count = store["count"]
+        if store["key"] != key or not count or len(events) < count:
+            df = events_to_df(events)
+        elif len(events) == count:
+            return store["df"]
+        else:
+            old = store["df"]
+            tail = events_to_df(events[count:])
+            # Event types seen in both parts, so the column stays categorical
+            types = union_categoricals(
+                [old["type"].array, tail["type"].array], sort_categories=True
+            )
+            df = pd.concat([old, tail], ignore_index=True)
+            df["type"] = types
+            # Clarity columns are all-None (object) until the first CLARITY event;
+            # re-infer where the parts disagree, as a full build would
+            for col in df.columns.drop("type"):
+                if old[col].dtype != tail[col].dtype:
+                    df[col] = df[col].infer_objects()
+            # Each part is sorted; re-sort only if the tail reaches back in time.
+            # Stable, so ties still keep log order as in events_to_df.
+            if tail["ts"].iloc[0] < old["ts"].iloc[-1]:
+                df = df.sort_values("ts", kind="stable", ignore_index=True)
+        store.update(key=key, count=len(events), df=df)
+        return df
+
+
+def _session_report_ready(path: str, require_analysis: bool = True) -> bool:
+    """
+    True once the backend has finished the session: the log has ended_at set
+    and (unless require_analysis is False) contains the FINAL_ANALYSIS event.
+    """
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+        # Cheap byte scan first: no need to parse a log that can't be finished yet
+        if require_analysis and b'"FINAL_ANALYSIS"' not in blob:
+            return False
+        data = orjson.loads(blob)
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        # Not written yet, or caught halfway through a write
+        return False
+    if data.get("ended_at") is None:
+        return False
+    if not require_analysis:
+        return True
+    # FINAL_ANALYSIS is logged last, so look from the end
+    return any(e.get("type") == "FINAL_ANALYSIS" for e in reversed(data.get("events", [])))
+
+
+def wait_for_session_report(path: str, timeout_s: float = 30.0, require_analysis: bool = True) -> bool:
+    """
+    Block until the finished session log is on disk, or `timeout_s` passes.
+    See _session_report_ready for `require_analysis`.
+
+    Instead of re-reading the log every second, this sleeps on file-system
+    events for the log's directory (inotify / FSEvents / ReadDirectoryChangesW)
+    and only re-checks when the log file itself changes.
+    """
+    if _session_report_ready(path, require_analysis):
+        return True
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.basename(path)
+
+    stop = threading.Event()
+    timer = threading.Timer(timeout_s, stop.set)
+    timer.start()
+    try:
+        # yield_on_timeout: re-check every few seconds even without events, in
+        # case the log was written before the watcher started
+        for changes in watch(directory, stop_event=stop, debounce=200,
+                             rust_timeout=5000, yield_on_timeout=True):
+            if changes and not any(os.path.basename(p) == name for _, p in changes):
+                continue
+            if _session_report_ready(path, require_analysis):
+                return True
+    finally:
+        timer.cancel()
+    return _session_report_ready(path, require_analysis)
+
+
 # =========================
 # Metrics computation
 # =========================
@@ -162,33 +367,25 @@ def compute_basic_metrics(session_data: dict, df_events: pd.DataFrame) -> Dict[s
             "idle_time_sec": 0.0,
         }
 
-    df = df_events.sort_values("ts").reset_index(drop=True)
-
     # Session duration:
     # - prefer started_at/ended_at if they are numeric (e.g. UNIX timestamps)
     # - otherwise use min/max ts from events
-    if isinstance(started_at, (int, float)) and isinstance(ended_at, (int, float)):
+    has_bounds = isinstance(started_at, (int, float)) and isinstance(ended_at, (int, float))
+    if has_bounds:
         session_total = float(ended_at - started_at)
     else:
-        session_total = float(df["ts"].max() - df["ts"].min())
-
-    # Aggregate durations per state using consecutive events
-    for i in range(len(df)):
-        state = df.loc[i, "state"]
-        current_ts = df.loc[i, "ts"]
-
-        if i < len(df) - 1:
-            next_ts = df.loc[i + 1, "ts"]
-            duration = float(next_ts - current_ts)
-        else:
-            # Last event: extend until session end if we know it
-            if isinstance(started_at, (int, float)) and isinstance(ended_at, (int, float)):
-                duration = float(session_total - current_ts)
-            else:
-                duration = 0.0
-
-        if isinstance(state, str) and state in durations:
-            durations[state] += max(duration, 0.0)
+        session_total = float(df_events["ts"].max() - df_events["ts"].min())
+
+    # Aggregate durations per state: each STATE lasts until the next one
+    df_state = df_events[df_events["type"] == "STATE"]
+    if not df_state.empty:
+        ts = df_state["ts"]
+        # Last state: extend until session end if we know it
+        last_end = session_total if has_bounds else ts.iloc[-1]
+        dur = (ts.shift(-1).fillna(last_end) - ts).clip(lower=0.0)
+        per_state = dur.groupby(df_state["state"], observed=True).sum()
+        for state in durations:
+            durations[state] = float(per_state.get(state, 0.0))
 
     result: Dict[str, Any] = {
         "hard_score": hard_score,
@@ -203,6 +400,35 @@ def compute_basic_metrics(session_data: dict, df_events: pd.DataFrame) -> Dict[s
     return result
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def compute_basic_metrics_cached(_session_data: dict, _df_events: pd.DataFrame, stamp: tuple) -> Dict[str, Any]:
+    """compute_basic_metrics keyed on the log's stamp (see session_log_stamp), like the loaders above."""
+    return compute_basic_metrics(_session_data, _df_events)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_leaderboard_cached(stamp: tuple) -> Tuple[List[Any], Dict[str, Any], pd.DataFrame]:
+    """
+    Leaderboard entries (best first), a name -> entry lookup and the display
+    table, re-read only when `stamp` (see leaderboard_stamp) changes.
+    """
+    entries = Leaderboard(LEADERBOARD_PATH).entries
+    # Built from the bottom up, so the best entry wins on duplicate names
+    entries_by_name = {entry.name: entry for entry in reversed(entries)}
+    # Narrow explicit dtypes: scores are 0-100, the total can be a half point
+    df = pd.DataFrame({
+        "Rank": pd.array(range(1, len(entries) + 1), dtype="int32"),
+        "Name": pd.array([entry.name for entry in entries], dtype="string"),
+        "Total Score": pd.array([entry.total_score for entry in entries], dtype="float32"),
+        "Hard Score": pd.array([entry.hard_score for entry in entries], dtype="int16"),
+        "Soft Score": pd.array([entry.soft_score for entry in entries], dtype="int16"),
+        "Timestamp": [entry.timestamp for entry in entries],
+    })
+    # One vectorized conversion instead of a Timestamp per row
+    df["Timestamp"] = pd.to_datetime(df["Timestamp"], unit="s").dt.strftime("%Y-%m-%d %H:%M")
+    return entries, entries_by_name, df
+
+
 # =========================
 # UI rendering functions
 # =========================
@@ -302,45 +528,33 @@ def render_timeline_section(df_events: pd.DataFrame) -> None:
         st.info("No STATE events to show in the timeline.")
         return
 
-    # 1. Transform events to intervals
-    # Sort by time
-    df_timeline = df_timeline.sort_values("ts").reset_index(drop=True)
-    
-    intervals = []
-    
+    # 1. Transform events to intervals: each state lasts until the next one
+    # (df_events is already sorted by ts)
     # We need the session end time to close the last interval
     # Try to find it in the original df_events or estimate it
     max_ts = df_events["ts"].max()
+    start = df_timeline["ts"]
+    # Last event goes until max_ts (or +1s if same)
+    end = start.shift(-1).fillna(max(max_ts, start.iloc[-1] + 1.0))
     
-    for i in range(len(df_timeline)):
-        current_state = df_timeline.loc[i, "state"]
-        start_time = df_timeline.loc[i, "ts"]
-        
-        # Determine end time
-        if i < len(df_timeline) - 1:
-            end_time = df_timeline.loc[i+1, "ts"]
-        else:
-            # Last event goes until max_ts (or +1s if same)
-            end_time = max(max_ts, start_time + 1.0)
+    df_intervals = pd.DataFrame({
+        "Activity": df_timeline["state"],
+        "Start": start,
+        "End": end,
+        "Duration (s)": (end - start).round(1),
+        "Timeline": "Session",  # Constant for single-line chart
+    })
+    df_intervals = df_intervals[end > start]
             
-        duration = end_time - start_time
-        
-        if duration > 0:
-            intervals.append({
-                "Activity": current_state,
-                "Start": start_time,
-                "End": end_time,
-                "Duration (s)": round(duration, 1)
-            })
-            
-    if not intervals:
+    if df_intervals.empty:
         st.info("Not enough data to generate timeline.")
         return
-        
-    df_intervals = pd.DataFrame(intervals)
-    df_intervals["Timeline"] = "Session" # Constant for single-line chart
+
     
     # 2. Create Altair Chart
+    # Imported here: altair is only needed once there is a timeline to draw
+    import altair as alt
+
     # Color mapping
     domain = ["CODING", "RESEARCHING", "IDLE"]
     range_colors = ["#3b82f6", "#f97316", "#9ca3af"] # Blue, Orange, Gray
@@ -349,7 +563,7 @@ def render_timeline_section(df_events: pd.DataFrame) -> None:
         x=alt.X('Start', title='Time (seconds)'),
         x2='End',
         y=alt.Y('Timeline', title=None, axis=None),
-        color=alt.Color('Activity', scale=alt.Scale(domain=domain, range=range_colors)),
+        color=alt.Color('Activity:N', scale=alt.Scale(domain=domain, range=range_colors)),
         tooltip=['Activity', 'Start', 'End', 'Duration (s)']
     ).properties(
         height=80
@@ -402,7 +616,7 @@ def render_clarity_section(df_events: pd.DataFrame) -> None:
     )
 
     # Latest clarity snapshot
-    latest = df_clarity.sort_values("ts").iloc[-1]
+    latest = df_clarity.iloc[-1]
     st.subheader("Latest clarity snapshot")
 
     c1, c2, c3 = st.columns(3)
@@ -484,6 +698,11 @@ def login_user(username, password):
     }
 }
 
+# Selector data derived from CHALLENGES once, not on every rerun
+_CHALLENGE_KEYS = tuple(CHALLENGES)
+_DISPLAY_MAP = {k: v["title"] for k, v in CHALLENGES.items()}
+_KEY_INDEX = {k: i for i, k in enumerate(_CHALLENGE_KEYS)}
+
 def render_sidebar_account():
     with st.sidebar:
         st.divider()
@@ -532,18 +751,14 @@ def render_challenges_tab():
     st.header("Available Challenges")
     
     # Challenge Selector
-    challenge_keys = list(CHALLENGES.keys())
-    # Create a mapping for display names
-    display_map = {k: CHALLENGES[k]["title"] for k in challenge_keys}
-    
     # If a session is active, lock the selection
     disabled = st.session_state.active_challenge
     
     selected_key = st.selectbox(
         "Choose a Challenge:",
-        options=challenge_keys,
-        format_func=lambda x: display_map[x],
-        index=challenge_keys.index(st.session_state.selected_challenge_key),
+        options=_CHALLENGE_KEYS,
+        format_func=_DISPLAY_MAP.__getitem__,
+        index=_KEY_INDEX[st.session_state.selected_challenge_key],
         disabled=disabled
     )
     
@@ -575,9 +790,9 @@ def render_challenges_tab():
             
             if st.button("💾 Submit Solution", type="primary"):
                 # Save code to file
-                os.makedirs("submissions", exist_ok=True)
-                filename = f"submissions/{user['name']}_solution.py"
-                with open(filename, "w") as f:
+                os.makedirs(SUBMISSIONS_DIR, exist_ok=True)
+                filename = os.path.join(SUBMISSIONS_DIR, f"{user['name']}_solution.py")
+                with open(filename, "w", encoding="utf-8") as f:
                     f.write(code_input)
                 
                 # Signal backend to stop
@@ -587,23 +802,8 @@ def render_challenges_tab():
                 st.success(f"Solution saved to {filename}!")
                 st.info("Stopping session and generating report... (this may take up to 30 seconds)")
                 
-                # Poll for completion (max 30 seconds)
-                import time
-                max_retries = 30
-                for i in range(max_retries):
-                    time.sleep(1)
-                    try:
-                        with open(os.path.join("data", "session_log.json"), "r") as f:
-                            data = json.load(f)
-                        
-                        # Check if session ended AND has final analysis
-                        if data.get("ended_at") is not None:
-                            # Also verify FINAL_ANALYSIS exists
-                            has_final = any(e.get("type") == "FINAL_ANALYSIS" for e in data.get("events", []))
-                            if has_final:
-                                break
-                    except:
-                        pass
+                # Wait for the backend's final report (max 30 seconds)
+                wait_for_session_report(SESSION_LOG_PATH, timeout_s=30)
                 
                 # Update state to show results
                 st.session_state.active_challenge = False
@@ -632,26 +832,39 @@ def render_challenges_tab():
                                 f.write("STOP")
                             
                             # 2. Wait for old process to finish
-                            import time
-                            time.sleep(2)
+                            backend_proc = st.session_state.get("backend_proc")
+                            if backend_proc is None:
+                                # Not started from this dashboard session, give it a moment
+                                time.sleep(2)
+                            elif backend_proc.poll() is None:
+                                # Wait only until it has written its report. After that it
+                                # sits at the leaderboard name prompt in its own console;
+                                # leave it there so that entry isn't lost.
+                                if not wait_for_session_report(SESSION_LOG_PATH, timeout_s=30, require_analysis=False):
+                                    backend_proc.terminate()
                             
                             # 3. Delete old session log
-                            log_path = os.path.join("data", "session_log.json")
-                            if os.path.exists(log_path):
-                                os.remove(log_path)
+                            for log_path in (SESSION_LOG_PATH, META_PATH, EVENTS_PATH):
+                                try:
+                                    os.remove(log_path)
+                                except OSError:
+                                    # Missing, or still held open by another process (Windows);
+                                    # the new session overwrites it anyway
+                                    pass
                             
                             # 4. Remove stop signal
-                            if os.path.exists("STOP_SESSION"):
+                            try:
                                 os.remove("STOP_SESSION")
+                            except FileNotFoundError:
+                                pass
                             
                             # Launch src/main.py in VISIBLE mode for debugging
-                            if sys.platform == "win32":
-                                subprocess.Popen(
-                                    "start cmd /k python src/main.py", 
-                                    shell=True
-                                )
-                            else:
-                                subprocess.Popen(["python", "src/main.py"])
+                            # (its own console window on Windows, no intermediate cmd.exe)
+                            st.session_state.backend_proc = subprocess.Popen(
+                                [sys.executable, "src/main.py"],
+                                creationflags=subprocess.CREATE_NEW_CONSOLE if sys.platform == "win32" else 0,
+                                close_fds=True,
+                            )
                             
                             st.session_state.active_challenge = True
                             st.session_state.view_mode = "CHALLENGE"
@@ -675,8 +888,8 @@ def render_results_view():
     
     # Load latest session log
     try:
-        with open(os.path.join("data", "session_log.json"), "r") as f:
-            data = json.load(f)
+        with open(SESSION_LOG_PATH, "rb") as f:
+            data = orjson.loads(f.read())
             
         user = st.session_state.user
         candidate_name = user['name'] if user else data.get("candidate_id", "Unknown")
@@ -692,11 +905,13 @@ def render_results_view():
         final_transcript = "No transcript available."
         final_comment = "No analysis available."
         
-        for event in data.get("events", []):
+        # It is logged at the very end of the session, so scan backwards
+        for event in reversed(data.get("events", [])):
             if event["type"] == "FINAL_ANALYSIS":
                 payload = event["payload"]
                 final_transcript = payload.get("transcript", "No transcript found.")
                 final_comment = payload.get("comment", "No comment found.")
+                break
         
         # Display Results
         col1, col2, col3 = st.columns(3)
@@ -753,8 +968,8 @@ def render_results_view():
                             
                             output_path = os.path.join("data", "certificates", "mint_data.json")
                             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                            with open(output_path, "w") as f:
-                                json.dump(mint_data, f, indent=4)
+                            with open(output_path, "wb") as f:
+                                f.write(orjson.dumps(mint_data, option=orjson.OPT_INDENT_2))
                         else:
                             st.error("Failed to sign voucher. Check admin private key.")
                             
@@ -772,26 +987,31 @@ def render_results_view():
     except Exception as e:
         st.error(f"Could not load results: {e}")
 
+@st.fragment(run_every="2s")
 def render_audit_tab():
     """
     Render the Live Audit tab (existing dashboard logic).
+    Runs as a fragment that refreshes itself every 2s: the session log is only
+    re-read when its stamp changes, and typing in the other tabs doesn't rerun it.
     """
     # 1) Load session data
+    log_path = SESSION_LOG_PATH
+    stamp = session_log_stamp(log_path)
     try:
-        session_data = load_session_log(os.path.join("data", "session_log.json"))
+        session_data = load_session_log_cached(log_path, stamp)
     except FileNotFoundError:
         st.warning("Waiting for session data... (Start a challenge first)")
         return
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         st.warning("Reading session data...")
         return
 
     # 2) Transform events into a DataFrame
     events = session_data.get("events", [])
-    df_events = events_to_df(events)
+    df_events = events_to_df_incremental(events, session_data.get("session_id"))
 
     # 3) Compute basic metrics
-    metrics = compute_basic_metrics(session_data, df_events)
+    metrics = compute_basic_metrics_cached(session_data, df_events, stamp)
 
     # 4) Render main UI sections
     render_summary_section(metrics)
@@ -806,37 +1026,23 @@ def render_audit_tab():
     with st.expander("Debug · raw session data"):
         st.json(session_data)
 
+@st.fragment
 def render_leaderboard_tab():
     """
-    Render the Leaderboard tab.
+    Render the Leaderboard tab. Runs as a fragment, so interactions in the other
+    tabs don't re-read the leaderboard.
     """
     st.header("🏆 Hall of Fame")
     st.caption("Top performing candidates ranked by their Total Score (Hard + Soft skills).")
     
-    lb = Leaderboard()
-    if not lb.entries:
+    entries, entries_by_name, df = load_leaderboard_cached(leaderboard_stamp())
+    if not entries:
         st.info("No entries yet. Complete a challenge to get on the leaderboard!")
         return
-
-    # Convert to DataFrame for display
-    data = []
-    for entry in lb.entries:
-        data.append({
-            "Rank": 0, # Placeholder
-            "Name": entry.name,
-            "Total Score": entry.total_score,
-            "Hard Score": entry.hard_score,
-            "Soft Score": entry.soft_score,
-            "Timestamp": pd.to_datetime(entry.timestamp, unit='s').strftime('%Y-%m-%d %H:%M'),
-            "_obj": entry # Hidden column for details
-        })
-    
-    df = pd.DataFrame(data)
-    df["Rank"] = range(1, len(df) + 1)
     
     # Display Main Table
     st.dataframe(
-        df[["Rank", "Name", "Total Score", "Hard Score", "Soft Score", "Timestamp"]],
+        df,
         column_config={
             "Total Score": st.column_config.ProgressColumn(
                 "Total Score",
@@ -853,18 +1059,27 @@ def render_leaderboard_tab():
     )
     
     st.divider()
+    render_submission_details(entries, entries_by_name)
+
+
+@st.fragment
+def render_submission_details(entries: List[Any], entries_by_name: Dict[str, Any]) -> None:
+    """
+    Candidate picker + details. Runs as a fragment: picking another candidate
+    reruns only this block, not the whole app.
+    """
     st.subheader("🔍 Submission Details")
     
     # Selection for details
     selected_name = st.selectbox(
         "Select a candidate to view details:",
-        options=df["Name"].tolist(),
+        options=[entry.name for entry in entries],
         index=0
     )
     
     if selected_name:
         # Find the entry object
-        entry = next((item["_obj"] for item in data if item["Name"] == selected_name), None)
+        entry = entries_by_name.get(selected_name)
         
         if entry:
             col1, col2 = st.columns(2)
@@ -1,30 +1,119 @@
+import functools
+import re
+import sched
+import sys
 import time
 import threading
 
-# for now only windows
+# Only used off Windows; on Windows the title comes straight from user32
 try:
     import pygetwindow as gw
 except ImportError:
     gw = None 
 
+# Win32 focus-change hook, so the sensor only wakes up when the foreground
+# window (or its title) actually changes. Other platforms fall back to polling.
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+WM_QUIT = 0x0012
+PM_NOREMOVE = 0x0000
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    # Private DLL handles so the prototypes below don't leak into pygetwindow
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.SetWinEventHook.argtypes = [
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _WinEventProc,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    ]
+    _user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+    _user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+    _user32.PeekMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT, wintypes.UINT]
+    _user32.TranslateMessage.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    _user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    _user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+else:
+    _user32 = None
+
+# Time per state is kept in a list indexed by state, not a dict keyed by name
+STATES = ("CODING", "RESEARCHING", "IDLE")
+_STATE_INDEX = {state: i for i, state in enumerate(STATES)}
+
 class ActiveWindowMonitor:
+    # Polling fallback: unchanged samples in a row before the interval starts doubling
+    POLL_BACKOFF_AFTER = 5
+
     def __init__(self, logger):
         self.logger = logger
-        self.running = False
-        self.stats = {
-            "CODING": 0,
-            "RESEARCHING": 0,
-            "IDLE": 0
-        }
+        # Set by stop(); both loops check it, so a stop() before run() sticks too.
+        # The polling loop waits on it, so stopping wakes it at once.
+        self._stop_event = threading.Event()
+        # Set by run() as its very last step, once stats are no longer written
+        self._done = threading.Event()
+        # Seconds spent per state, in STATES order (see the stats property)
+        self._times = [0.0, 0.0, 0.0]
+        # Running sum of self._times, kept alongside it so scoring needn't re-sum
+        self._total_time = 0.0
         # type of activities
         self.keywords = {
             "CODING": ["code", "pycharm", "visual studio", "sublime", "vim", ".py", "main.py", "vscode", "glassbox", "streamlit"],
             "RESEARCHING": ["chrome", "firefox", "edge", "stack overflow", "google", "documentation", "gpt", "claude"]
         }
+        # Flattened once; lowercased here because titles arrive lowercased
+        # and _classify_state never lowers them again
+        self._coding_kw = tuple(key.lower() for key in self.keywords["CODING"])
+        self._research_kw = tuple(key.lower() for key in self.keywords["RESEARCHING"])
+        
+        # All keywords compiled into one pattern, so a title is scanned once in C
+        # instead of once per keyword. The lookahead reports a match at every
+        # position (overlapping keywords included), and CODING keywords come first
+        # in the alternation so they win wherever both kinds could match.
+        self._keyword_state = {}
+        for state, keys in (("CODING", self._coding_kw), ("RESEARCHING", self._research_kw)):
+            for key in keys:
+                self._keyword_state.setdefault(key, state)
+        self._keyword_re = re.compile(
+            "(?=(" + "|".join(map(re.escape, self._keyword_state)) + "))"
+        )
+        # Titles repeat a lot (switching back and forth between the same few
+        # windows), so remember recent classifications. Wrapped per instance so
+        # the cache doesn't outlive the monitor or mix keyword sets.
+        self._classify_state = functools.lru_cache(maxsize=256)(self._classify_state)
+        
+        # Last seen title and its state.
+        # An empty title classifies as IDLE, so this pair is a valid cache entry.
+        self._last_title = ""
+        self._last_state = "IDLE"
+        self._last_idx = _STATE_INDEX["IDLE"]
+        
+        # Event-driven mode (Windows): hook thread id for stop()
+        self._hook_thread_id = None
+        # When the current state started; time is credited at each change, in both modes
+        self._state_since = None
+        
+        # Reused for every Win32 title read; longer titles are truncated,
+        # which is fine for keyword matching
+        self._title_buf = ctypes.create_unicode_buffer(512) if _user32 is not None else None
 
     def _get_active_window_title(self):
+        if _user32 is not None:
+            return self._window_title(_user32.GetForegroundWindow())
+        
         if gw is None: 
-            return "Mock Window - Google Chrome" 
+            return "mock window - google chrome" 
         
         try:
             window = gw.getActiveWindow()
@@ -35,58 +124,169 @@ class ActiveWindowMonitor:
             return ""
 
     def _classify_state(self, title):
-        """classify state by window title"""
+        """classify state by window title (expects the lowercased title)"""
         if not title: 
             return "IDLE"
         
-        title = title.lower()
-        
-        for key in self.keywords["CODING"]:
-            if key in title: 
+        # CODING anywhere in the title beats RESEARCHING
+        state = "IDLE"
+        for match in self._keyword_re.finditer(title):
+            if self._keyword_state[match.group(1)] == "CODING":
                 return "CODING"
-        
-        for key in self.keywords["RESEARCHING"]:
-            if key in title: 
-                return "RESEARCHING"
+            state = "RESEARCHING"
             
-        return "IDLE"
+        return state
 
-    def run(self, interval=1.0):
-        self.running = True
-        last_state = None
-        last_title = ""
-        
+    def _on_title(self, title):
+        """Classify and log a title change. Returns the current (possibly cached) state."""
+        # Same window as before: reuse the cached state, skip classification
+        if title != self._last_title:
+            new_state = self._classify_state(title)
+            
+            # Write to log (the logger itself drops repeats of the same state)
+            self.logger.log_state(new_state)
+            
+            # Switching tabs within the same kind of window is not worth a line
+            if new_state != self._last_state:
+                print(f"// Action: {new_state} | Title changed: {title[:50]}...")
+                self._last_state = new_state
+                self._last_idx = _STATE_INDEX[new_state]
+            self._last_title = title
+        return self._last_state
+
+    def run(self, interval=0.5, max_interval=5.0):
         print("Sensor linked to Real SessionLogger...")
 
-        while self.running:
-            title = self._get_active_window_title()
-            new_state = self._classify_state(title)
+        try:
+            if _user32 is not None:
+                self._run_event_driven()
+            else:
+                self._run_polling(interval, max_interval)
+        finally:
+            self._done.set()
 
-            if title != last_title:
-                
-                # Write to log
-                self.logger.log_state(new_state)
-                
-                print(f"// Action: {new_state} | Title changed: {title[:50]}...")
-                
-                last_state = new_state
-                last_title = title
+    def _tick(self):
+        """One polling step: sample the active window. Returns True if the title changed."""
+        title = self._get_active_window_title()
+        if title == self._last_title:
+            # Nothing to credit yet: time is added per state at each change, not per tick
+            return False
+        self._credit_time()
+        self._on_title(title)
+        return True
 
-            self.stats[new_state] += interval
-            
-            time.sleep(interval)
+    def _run_polling(self, interval, max_interval):
+        """
+        Fallback: sample the active window every `interval` seconds. While the
+        title stays the same the interval doubles, up to `max_interval`; any
+        title change drops it back to `interval`.
+        """
+        # The scheduler sleeps on the stop event, so stop() cuts the wait short;
+        # the pending tick is then dropped and scheduler.run() returns.
+        def delay(seconds):
+            if self._stop_event.wait(seconds):
+                for event in scheduler.queue:
+                    scheduler.cancel(event)
+
+        scheduler = sched.scheduler(time.monotonic, delay)
+        unchanged = 0
+        step = interval
+
+        def tick(due):
+            nonlocal unchanged, step
+            if self._tick():
+                unchanged, step = 0, interval
+            else:
+                unchanged += 1
+                if unchanged >= self.POLL_BACKOFF_AFTER:
+                    step = min(step * 2, max_interval)
+            # Next tick on an absolute deadline, so time spent in a tick doesn't add drift
+            if not self._stop_event.is_set():
+                scheduler.enterabs(due + step, 0, tick, (due + step,))
+
+        self._state_since = time.monotonic()
+        tick(self._state_since)
+        scheduler.run()
+        # Close the last open stretch
+        self._credit_time()
+
+    def _window_title(self, hwnd):
+        """Lowercased title of a window handle (Win32)."""
+        if not hwnd:
+            return ""
+        # ctypes drops the GIL for the duration of the call
+        if not _user32.GetWindowTextW(hwnd, self._title_buf, len(self._title_buf)):
+            return ""
+        return self._title_buf.value.lower()
+
+    def _credit_time(self):
+        """Add the time since the last change to the current state (both modes)."""
+        now = time.monotonic()
+        elapsed = now - self._state_since
+        self._times[self._last_idx] += elapsed
+        self._total_time += elapsed
+        self._state_since = now
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, event_thread, event_time):
+        """WinEvent callback: foreground window switched or its title changed."""
+        if event == EVENT_OBJECT_NAMECHANGE and (
+                id_object != OBJID_WINDOW or hwnd != _user32.GetForegroundWindow()):
+            return
+        self._credit_time()
+        self._on_title(self._window_title(hwnd))
+
+    def _run_event_driven(self):
+        """Windows: sleep in a message loop, wake only on focus/title changes."""
+        self._state_since = time.monotonic()
+        self._on_title(self._window_title(_user32.GetForegroundWindow()))
+        
+        # Keep a reference to the callback, ctypes must not garbage-collect it
+        self._win_event_proc = _WinEventProc(self._on_win_event)
+        hooks = [
+            _user32.SetWinEventHook(event, event, 0, self._win_event_proc, 0, 0, WINEVENT_OUTOFCONTEXT)
+            for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE)
+        ]
+        
+        msg = wintypes.MSG()
+        # Make sure this thread has a message queue before stop() can post to it
+        _user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+        self._hook_thread_id = _kernel32.GetCurrentThreadId()
+        try:
+            # The thread id is published before the stop event is checked, and stop()
+            # sets the event before reading the id: a stop() racing with startup is
+            # either seen here or gets its WM_QUIT posted, never neither.
+            while not self._stop_event.is_set() and _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    _user32.UnhookWinEvent(hook)
+            self._hook_thread_id = None
+            self._credit_time()
 
     def stop(self):
-        self.running = False
+        self._stop_event.set()
+        # Wake the event-driven message loop
+        if self._hook_thread_id is not None:
+            _user32.PostThreadMessageW(self._hook_thread_id, WM_QUIT, 0, 0)
+
+    def wait_stopped(self, timeout=None):
+        """Block until run() has returned, so stats can be read safely. Returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def stats(self):
+        """Seconds per state as a {state: seconds} dict"""
+        return dict(zip(STATES, self._times))
 
     def calculate_hard_score(self):
         """calculate hard score"""
-        total_time = sum(self.stats.values())
-        if total_time == 0: 
+        if self._total_time == 0: 
             return 0
         
-        coding = self.stats["CODING"]
-        research = self.stats["RESEARCHING"]
+        coding = self._times[_STATE_INDEX["CODING"]]
+        research = self._times[_STATE_INDEX["RESEARCHING"]]
         
         # Simple formula (will be changed)
         if coding > research: 
@@ -1,7 +1,7 @@
 import speech_recognition as sr
 import threading
 import time
-import os
+import queue
 import numpy as np
 import sounddevice as sd
 from scipy.io import wavfile as wav
@@ -16,9 +16,22 @@ class AudioListener:
         self.fs = 44100  # Sample rate
         self.seconds = 5  # Duration of recording chunk (Reduced to 5s for faster response)
         self.device_index = None
+        self.blocksize = 2048  # Frames per InputStream callback
+        self._stream = None
+        
+        # Capture -> consumer handoff. The stream callback only enqueues blocks;
+        # the listen loop stitches them into fixed-size chunks.
+        self._ring = queue.SimpleQueue()
+        self._pending = []  # Blocks not yet consumed into a chunk
+        self._pending_len = 0
+        self._pending_voiced = False  # Any non-silent block among them?
         
         # Data accumulation
-        self.audio_buffer = [] # List of numpy arrays
+        # Session recording lives in one preallocated buffer (no list + concatenate).
+        # It starts at 10 minutes and doubles when full, capped at 1 hour.
+        self.max_record_seconds = 3600
+        self._session_buf = np.empty((self.fs * 600, 1), dtype=np.int16)
+        self._session_len = 0
         self.full_transcript = [] # List of strings
         
         # Auto-detect WO Mic
@@ -32,71 +45,108 @@ class AudioListener:
         if self.device_index is None:
             print("[AudioListener] WO Mic not found, using default device.")
 
+    def _store_audio(self, samples):
+        """Copy captured samples into the session buffer."""
+        end = self._session_len + samples.shape[0]
+        if end > self._session_buf.shape[0]:
+            capacity = min(max(end, 2 * self._session_buf.shape[0]), self.fs * self.max_record_seconds)
+            if capacity > self._session_buf.shape[0]:
+                grown = np.empty((capacity, 1), dtype=self._session_buf.dtype)
+                grown[:self._session_len] = self._session_buf[:self._session_len]
+                self._session_buf = grown
+            # Past the cap: keep what fits, drop the rest
+            samples = samples[:capacity - self._session_len]
+            end = self._session_len + samples.shape[0]
+        self._session_buf[self._session_len:end] = samples
+        self._session_len = end
+
+    def _on_audio(self, indata, frames, time_info, status):
+        """
+        sounddevice callback (runs on the audio thread): just hand the block over,
+        flagged as silent when the device reports an underflow or the block is all zeros.
+        """
+        voiced = not status.input_underflow and indata.any()
+        self._ring.put_nowait((indata.copy(), voiced))
+
+    def _next_chunk(self):
+        """
+        Collect captured blocks until a full chunk (self.seconds of audio) is available.
+        Returns (chunk, voiced) where voiced is False if every block in it was silent,
+        or None once the listener is stopped.
+        """
+        chunk_len = int(self.seconds * self.fs)
+        voiced = False
+        while self._pending_len < chunk_len:
+            if not self.running:
+                return None
+            try:
+                block, voiced = self._ring.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._pending.append(block)
+            self._pending_len += block.shape[0]
+            self._pending_voiced = self._pending_voiced or voiced
+        
+        window = np.concatenate(self._pending, axis=0)
+        chunk, rest = window[:chunk_len], window[chunk_len:]
+        chunk_voiced = self._pending_voiced
+        # The leftover samples come from the last block received
+        self._pending = [rest] if rest.shape[0] else []
+        self._pending_len = rest.shape[0]
+        self._pending_voiced = voiced and rest.shape[0] > 0
+        return chunk, chunk_voiced
+
     def _listen_loop(self):
         print(f"[AudioListener] Started listening loop (Device Index: {self.device_index})...")
         
         while self.running:
             try:
-                # Record audio
-                print("[AudioListener] Recording chunk...")
-                myrecording = sd.rec(int(self.seconds * self.fs), samplerate=self.fs, channels=1, device=self.device_index)
-                sd.wait()  # Wait until recording is finished
+                # Wait for the next chunk; capture keeps running meanwhile
+                next_chunk = self._next_chunk()
+                if next_chunk is None:
+                    break
+                myrecording, voiced = next_chunk
                 
                 # Store raw audio
-                self.audio_buffer.append(myrecording)
+                self._store_audio(myrecording)
                 
-                # Check if silent (simple energy threshold)
-                volume_norm = np.linalg.norm(myrecording) * 10
-                # print(f"[AudioListener] Volume: {volume_norm:.2f}")
+                # Digital silence / underflow only: no need for the energy check
+                if not voiced:
+                    print("[AudioListener] Too quiet, skipping...")
+                    continue
                 
-                if volume_norm < 0.05: # Lowered threshold significantly
+                # Check if silent (simple energy threshold).
+                # Same test as norm(x) * 10 < 0.05 on float audio, squared and scaled
+                # to int16 units. Widen to int64 so the sum of squares can't overflow.
+                flat = myrecording.ravel().astype(np.int64)
+                energy = int(np.dot(flat, flat))
+                # print(f"[AudioListener] Energy: {energy}")
+                
+                if energy < (0.005 * 32767) ** 2: # Lowered threshold significantly
                     print("[AudioListener] Too quiet, skipping...")
                     continue
 
-                # Save as temporary WAV for speech_recognition
-                # Use unique filename to avoid locking issues
-                import uuid
-                temp_filename = f"temp_chunk_{uuid.uuid4().hex}.wav"
-                
-                # Convert to 16-bit PCM for wavfile write
-                data = (myrecording * 32767).astype(np.int16)
-                wav.write(temp_filename, self.fs, data)
+                # Chunk is already 16-bit PCM: hand the raw bytes to speech_recognition
+                # (no temp WAV file round-trip)
+                audio_data = sr.AudioData(myrecording.tobytes(), self.fs, 2)  # 2 bytes per sample
                 
                 # Transcribe
                 try:
-                    with sr.AudioFile(temp_filename) as source:
-                        audio_data = self.recognizer.record(source)
+                    transcript = self.recognizer.recognize_google(audio_data)
+                    print("-" * 50)
+                    print(f"[Candidate (Voice)]: {transcript}")
+                    print("-" * 50)
+                    
+                    if len(transcript.split()) >= 2:
+                        # Accumulate transcript for final analysis
+                        self.full_transcript.append(transcript)
+                        print(f"[Transcript Captured] ({len(transcript.split())} words)")
                         
-                        try:
-                            transcript = self.recognizer.recognize_google(audio_data)
-                            print("-" * 50)
-                            print(f"[Candidate (Voice)]: {transcript}")
-                            print("-" * 50)
-                            
-                            if len(transcript.split()) >= 2:
-                                # Accumulate transcript for final analysis
-                                self.full_transcript.append(transcript)
-                                print(f"[Transcript Captured] ({len(transcript.split())} words)")
-                                
-                        except sr.UnknownValueError:
-                            # print("[AudioListener] Unintelligible (could not understand audio)")
-                            pass # Unintelligible
-                        except sr.RequestError:
-                            print("[AudioListener] API unavailable")
-                finally:
-                    # Always cleanup temp file
-                    if os.path.exists(temp_filename):
-                        try:
-                            os.remove(temp_filename)
-                        except Exception as e:
-                            print(f"[AudioListener] Cleanup warning: {e}")
-                
-                # Cleanup (redundant check but safe)
-                if os.path.exists(temp_filename):
-                    try:
-                        os.remove(temp_filename)
-                    except:
-                        pass
+                except sr.UnknownValueError:
+                    # print("[AudioListener] Unintelligible (could not understand audio)")
+                    pass # Unintelligible
+                except sr.RequestError:
+                    print("[AudioListener] API unavailable")
                     
             except Exception as e:
                 print(f"[AudioListener] Error: {e}")
@@ -106,27 +156,52 @@ class AudioListener:
         if self.running:
             return
         self.running = True
+        self._stream = sd.InputStream(
+            samplerate=self.fs,
+            channels=1,
+            device=self.device_index,
+            blocksize=self.blocksize,
+            dtype='int16',
+            callback=self._on_audio
+        )
+        self._stream.start()
         self.thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.thread.start()
 
     def stop(self):
         self.running = False
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
         if self.thread:
             self.thread.join(timeout=1)
+        
+        # Keep the tail that never filled a whole chunk in the recording
+        while True:
+            try:
+                block, _ = self._ring.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.append(block)
+        if self._pending:
+            for block in self._pending:
+                self._store_audio(block)
+            self._pending = []
+            self._pending_len = 0
+            self._pending_voiced = False
         print("[AudioListener] Stopped.")
 
     def save_recording(self, filename: str):
         """Save the full session audio to a WAV file."""
-        if not self.audio_buffer:
+        if not self._session_len:
             print("[AudioListener] No audio recorded.")
             return
             
         print(f"[AudioListener] Saving full recording to {filename}...")
         try:
-            full_audio = np.concatenate(self.audio_buffer, axis=0)
-            # Convert to 16-bit PCM
-            data = (full_audio * 32767).astype(np.int16)
-            wav.write(filename, self.fs, data)
+            # Buffer is already 16-bit PCM
+            wav.write(filename, self.fs, self._session_buf[:self._session_len])
             print("[AudioListener] Recording saved successfully.")
         except Exception as e:
             print(f"[AudioListener] Failed to save recording: {e}")